@@ -1,19 +1,27 @@
 import csv
+import collections
+import functools
 import os
 import argparse
 import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import sys
 import json
+import pickle
+import shlex
+import shutil
 sys.path.append(str(Path(__file__).parent.parent))
 
 from src.config import CODEQL_DB_PATH, PROJECT_SOURCE_CODE_DIR, IRIS_ROOT_DIR, BUILD_INFO, DEP_CONFIGS, DATA_DIR, CODEQL_DIR, CVES_MAPPED_W_COMMITS_DIR
-from scripts.docker_utils import ensure_image, create_container, exec_in_container, parse_project_image, copy_dir_to_container, copy_from_container
-ALLVERSIONS = json.load(open(DEP_CONFIGS))
+from scripts.docker_utils import ensure_image, create_container, exec_in_container, parse_project_image, copy_dir_to_container, copy_file_to_container, copy_from_container
+with open(DEP_CONFIGS) as _f:
+    ALLVERSIONS = json.load(_f)
 
 # Path to custom build commands CSV
 BUILD_CMDS_CSV = os.path.join(DATA_DIR, "build_cmds.csv")
 
+@functools.lru_cache(maxsize=None)
 def load_custom_build_commands(csv_path: str = BUILD_CMDS_CSV) -> dict[str, str]:
     """
     Load custom build commands from the build command CSV file
@@ -34,40 +42,92 @@ def load_custom_build_commands(csv_path: str = BUILD_CMDS_CSV) -> dict[str, str]
 # Custom build commands for the CodeQL database creation (loaded from CSV)
 CUSTOM_BUILD_COMMANDS: dict[str, str] = load_custom_build_commands()
 
+# bin directories of the installed toolchains, resolved once per process
+MVN_BIN = {v: os.path.join(p, 'bin') for v, p in ALLVERSIONS['mvn'].items()}
+GRADLE_BIN = {v: os.path.join(p, 'bin') for v, p in ALLVERSIONS['gradle'].items()}
+JDK_BIN = {v: os.path.join(p, 'bin') for v, p in ALLVERSIONS['jdks'].items()}
+
+# Environment inherited by every CodeQL build, captured once per process
+_BASE_ENV = os.environ.copy()
+
 def setup_environment(row):
-    env = os.environ.copy()
-    
-    # Set Maven path
-    mvn_version = row.get('mvn_version', 'n/a')
-    if mvn_version != 'n/a':
-        MAVEN_PATH = ALLVERSIONS['mvn'].get(mvn_version, None)
-        if MAVEN_PATH:
-            env['PATH'] = f"{os.path.join(MAVEN_PATH, 'bin')}:{env.get('PATH', '')}"
-            print(f"Maven path set to: {MAVEN_PATH}")
+    return _toolchain_environment(row.jdk_version, row.mvn_version, row.gradle_version)
 
-    # Set Gradle path
-    gradle_version = row.get('gradle_version', 'n/a')
-    if gradle_version != 'n/a':
-        GRADLE_PATH = ALLVERSIONS['gradle'].get(gradle_version, None)
-        if GRADLE_PATH:
-            env['PATH'] = f"{os.path.join(GRADLE_PATH, 'bin')}:{env.get('PATH', '')}"
-            print(f"Gradle path set to: {GRADLE_PATH}")
+@functools.lru_cache(maxsize=None)
+def _toolchain_environment(java_version, mvn_version, gradle_version):
+    """
+    Build the environment for a JDK/Maven/Gradle combination.
+    Rows sharing a toolchain share the same env dict, so callers must not mutate it.
+    """
+    env = _BASE_ENV.copy()
+    path_entries = []
 
     # Find and set Java home
-    java_version = row['jdk_version']
     java_home = ALLVERSIONS['jdks'].get(java_version, None)
     if not java_home:
         raise Exception(f"Java version {java_version} not found in available installations.")
 
     env['JAVA_HOME'] = java_home
     print(f"JAVA_HOME set to: {java_home}")
-    
-    # Add Java binary to PATH
-    env['PATH'] = f"{os.path.join(java_home, 'bin')}:{env.get('PATH', '')}"
-    
+    path_entries.append(JDK_BIN[java_version])
+
+    # Set Gradle path
+    if gradle_version != 'n/a':
+        GRADLE_PATH = ALLVERSIONS['gradle'].get(gradle_version, None)
+        if GRADLE_PATH:
+            path_entries.append(GRADLE_BIN[gradle_version])
+            print(f"Gradle path set to: {GRADLE_PATH}")
+
+    # Set Maven path
+    if mvn_version != 'n/a':
+        MAVEN_PATH = ALLVERSIONS['mvn'].get(mvn_version, None)
+        if MAVEN_PATH:
+            path_entries.append(MVN_BIN[mvn_version])
+            print(f"Maven path set to: {MAVEN_PATH}")
+
+    # Toolchain bin dirs take precedence over the inherited PATH
+    path_entries.append(_BASE_ENV.get('PATH', ''))
+    env['PATH'] = os.pathsep.join(path_entries)
+
     return env
 
-def create_codeql_database(project_slug, env, db_base_path, sources_base_path):
+def _available_ram_mb():
+    """
+    Memory available for new work on the host in MB (MemAvailable, which counts reclaimable page cache),
+    or None if it cannot be determined.
+    """
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def codeql_resource_flags(jobs: int, threads=None, ram=None) -> list[str]:
+    """
+    Give each of `jobs` concurrent CodeQL builds an equal share of the host's cores and 80% of its available memory.
+    Explicit `threads` and `ram` (in MB) are used as-is for every build.
+    """
+    if threads is None:
+        threads = max(1, (os.cpu_count() or 1) // jobs)
+    flags = ["--threads", str(threads)]
+    if ram is None:
+        available_mb = _available_ram_mb()
+        if available_mb:
+            ram = int(available_mb * 0.8) // jobs
+    if ram:
+        flags += ["--ram", str(ram)]
+    return flags
+
+@functools.lru_cache(maxsize=None)
+def _java_version(java_home: str) -> str:
+    """`java -version` output of a JDK, probed once per JAVA_HOME since each probe starts a JVM."""
+    return subprocess.check_output([os.path.join(java_home, 'bin', 'java'), '-version'],
+                                   stderr=subprocess.STDOUT).decode()
+
+def create_codeql_database(project_slug, env, db_base_path, sources_base_path, extra_flags=(), verbose=False):
     print("\nEnvironment variables for CodeQL database creation:")
     print(f"PATH: {env.get('PATH', 'Not set')}")
     print(f"JAVA_HOME: {env.get('JAVA_HOME', 'Not set')}")
@@ -75,26 +135,24 @@ def create_codeql_database(project_slug, env, db_base_path, sources_base_path):
     # Prefer custom build command when available
     custom_cmd = CUSTOM_BUILD_COMMANDS.get(project_slug)
     
-    try:
-        java_version = subprocess.check_output(['java', '-version'], 
-                                            stderr=subprocess.STDOUT, 
-                                            env=env).decode()
-        print(f"\nJava version check:\n{java_version}")
-    except subprocess.CalledProcessError as e:
-        print(f"Error checking Java version: {e}")
-        raise
-    
-    database_path = os.path.abspath(os.path.join(db_base_path, project_slug))
-    source_path = os.path.abspath(os.path.join(sources_base_path, project_slug))
+    if verbose:
+        try:
+            java_version = _java_version(env['JAVA_HOME'])
+            print(f"\nJava version check:\n{java_version}")
+        except subprocess.CalledProcessError as e:
+            print(f"Error checking Java version: {e}")
+            raise
     
-    Path(database_path).parent.mkdir(parents=True, exist_ok=True)
+    # main() resolves both base paths and creates the database base dir once
+    database_path = os.path.join(db_base_path, project_slug)
+    source_path = os.path.join(sources_base_path, project_slug)
     
     command = [
         "codeql", "database", "create",
         database_path,
         "--source-root", source_path,
         "--language", "java",
-        "--overwrite",
+        *extra_flags,
     ]
     if custom_cmd:
         print(f"Using custom build command for {project_slug}: {custom_cmd}")
@@ -104,19 +162,163 @@ def create_codeql_database(project_slug, env, db_base_path, sources_base_path):
         print(f"Creating database at: {database_path}")
         print(f"Using source path: {source_path}")
         print(f"Using JAVA_HOME: {env.get('JAVA_HOME', 'Not set')}")
-        res=subprocess.run(command, env=env, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if res.returncode != 0:
-            print(f"Error creating CodeQL database: {res.stderr.decode()} \n {res.stdout.decode()}")
-            raise subprocess.CalledProcessError(res.returncode, command, output=res.stdout, stderr=res.stderr)
+        # Inherit our stdout/stderr so CodeQL progress is shown live instead of filling a pipe
+        subprocess.run(command, env=env, check=True)
         print(f"Successfully created CodeQL database for {project_slug}")
     except subprocess.CalledProcessError as e:
         print(f"Error creating CodeQL database for {project_slug}: {e}")
-        print(f'\nStdout Info:\n{e.stdout.decode()}')
-        print(f'Stderr Info:\n{e.stderr.decode()}')
         raise
 
 
-def create_codeql_database_in_container(project_slug: str, row: dict, db_base_path: str, verbose: bool = False) -> None:
+@functools.lru_cache(maxsize=None)
+def _load_repo_index() -> dict[str, tuple[str, str]]:
+    """
+    Read project_info.csv once and index it by project slug.
+    Returns a mapping of project_slug -> (repo_url, commit_id).
+    """
+    with open(CVES_MAPPED_W_COMMITS_DIR, 'r') as f:
+        reader = csv.reader(f)
+        next(reader, None)  # header
+        index: dict[str, tuple[str, str]] = {}
+        for line in reader:
+            if len(line) > 10:
+                # Keep the first row per slug, matching the previous linear scan
+                index.setdefault(line[1], (line[8], line[10]))
+        return index
+
+def get_repo_info_from_project_info(slug: str) -> tuple[str, str]:
+    """Look up the repository URL and buggy commit of a project in project_info.csv."""
+    try:
+        return _load_repo_index()[slug]
+    except KeyError:
+        raise RuntimeError(f"Project slug '{slug}' not found in project_info.csv")
+
+# Paths used inside the project containers
+CONTAINER_CODEQL_DIR = "/codeql"
+CONTAINER_CODEQL_BIN = f"{CONTAINER_CODEQL_DIR}/codeql"
+CONTAINER_OUT_BASE = "/out"
+CONTAINER_SOURCE_ROOT = "/workspace/repo"
+CONTAINER_PATCHES_DIR = "/patches"
+
+# Directory of per-project patches applied after fetching the sources
+PATCHES_DIR = os.path.join(DATA_DIR, "patches")
+
+# Patch file names available in PATCHES_DIR, listed once instead of stat-ing per project
+try:
+    _PATCH_SET = frozenset(os.listdir(PATCHES_DIR))
+except OSError:
+    _PATCH_SET = frozenset()
+
+# Bind-mount the CodeQL CLI, patches and output dir instead of copying them in and out of the container.
+# Host paths are only meaningful to the daemon when we are not ourselves running inside a container.
+USE_BIND_MOUNTS = not os.path.exists("/.dockerenv")
+
+# Number of trailing output lines kept from in-container commands for error reporting
+ERROR_TAIL_LINES = 200
+
+def _start_container(image: str, host_db_dir: str):
+    """Create and start a container for `image` with the CodeQL CLI available and `host_db_dir` as its output dir."""
+    volumes = None
+    if USE_BIND_MOUNTS:
+        volumes = {
+            os.path.abspath(CODEQL_DIR): {"bind": CONTAINER_CODEQL_DIR, "mode": "ro"},
+            host_db_dir: {"bind": CONTAINER_OUT_BASE, "mode": "rw"},
+            os.path.abspath(PATCHES_DIR): {"bind": CONTAINER_PATCHES_DIR, "mode": "ro"},
+        }
+    container = create_container(image=image, working_dir=CONTAINER_SOURCE_ROOT, volumes=volumes)
+    container.start()
+
+    if not USE_BIND_MOUNTS:
+        # Copy CodeQL CLI into container and ensure out dir exists
+        copy_dir_to_container(container, CODEQL_DIR, CONTAINER_CODEQL_DIR)
+        exec_in_container(container, ["mkdir", "-p", CONTAINER_OUT_BASE])
+    return container
+
+# Marker echoed before each step of the in-container build script
+STEP_MARKER = "IRIS_STEP="
+
+def _failed_step(output: str, steps: list) -> str:
+    """Name of the last step whose marker appears in `output`, i.e. the step that failed."""
+    for line in reversed(output.splitlines()):
+        if line.startswith(STEP_MARKER):
+            return line[len(STEP_MARKER):].strip()
+    # Only the tail of the output is kept, so a missing marker means a long-running final step
+    return steps[-1][0]
+
+def _build_in(container, project_slug: str, container_db_dir: str, verbose: bool = False, extra_flags: tuple = ()) -> None:
+    """Fetch, patch and extract `project_slug` into `container_db_dir` inside an acquired container."""
+    # Fresh fetch like fetch_one.py: reclone at desired commit
+    repo_url, commit_id = get_repo_info_from_project_info(project_slug)
+    patch_name = f"{project_slug}.patch"
+    has_patch = patch_name in _PATCH_SET
+    fetch_cmd = (
+        f"rm -rf repo && mkdir -p repo && cd repo && "
+        f"git init && git remote add origin {shlex.quote(repo_url)} && "
+        f"git -c protocol.version=2 fetch --no-tags --depth 1 origin {shlex.quote(commit_id)} && "
+        f"git reset --hard FETCH_HEAD"
+    )
+    print(f"Refreshing sources from {repo_url} @ {commit_id}")
+    steps = [("fetch", fetch_cmd)]
+
+    # Apply project patch if available (mirror fetch_one.py behavior)
+    if has_patch:
+        print(f"Found patch for {project_slug}, applying...")
+        if not USE_BIND_MOUNTS:
+            # Ship only this project's patch rather than the whole patches dir
+            copy_file_to_container(container, os.path.join(PATCHES_DIR, patch_name), f"{CONTAINER_PATCHES_DIR}/{patch_name}")
+        patch_path = shlex.quote(f"{CONTAINER_PATCHES_DIR}/{patch_name}")
+        # Only the patch step may need the branch tips; unpatched projects just need the commit
+        steps.append(("patch", (
+            f"cd {CONTAINER_SOURCE_ROOT} && "
+            f"git -c protocol.version=2 fetch --no-tags --depth 1 origin '+refs/heads/*:refs/remotes/origin/*' && "
+            f"git apply {patch_path}"
+        )))
+    else:
+        print("No patch found; skipping patching.")
+
+    # Prefer custom build command when available
+    custom_cmd = CUSTOM_BUILD_COMMANDS.get(project_slug)
+    codeql_argv = [
+        CONTAINER_CODEQL_BIN, "database", "create", container_db_dir,
+        "--source-root", CONTAINER_SOURCE_ROOT,
+        "--language", "java",
+        *extra_flags,
+    ]
+    if custom_cmd:
+        print(f"Using custom build command for {project_slug}: {custom_cmd}")
+        codeql_argv += ["--command", custom_cmd]
+    steps.append(("codeql", f"cd {CONTAINER_SOURCE_ROOT} && {shlex.join(codeql_argv)}"))
+
+    print(f"Initializing database at {container_db_dir}.")
+    # Run every step in one exec to save daemon round-trips. This is a plain (non-login) shell;
+    # the images set their toolchain PATH via ENV. Each step runs in a subshell so `cd` does not leak.
+    script = " && ".join(f"echo {STEP_MARKER}{name} && ({cmd})" for name, cmd in steps)
+    code, output = exec_in_container(
+        container,
+        ["bash", "-c", script],
+        workdir="/workspace",
+        stream=verbose,
+        tail_lines=ERROR_TAIL_LINES,
+    )
+    if code == 0:
+        return
+
+    step = _failed_step(output, steps)
+    if step == "fetch":
+        if output:
+            print(output)
+        raise RuntimeError(f"Failed to fetch sources for {project_slug}")
+    if step == "patch":
+        if output:
+            print(output)
+        raise RuntimeError(f"Failed to apply patch for {project_slug}")
+    print(f"CodeQL database creation failed for {project_slug}")
+    if not verbose and output:
+        print("Error output:")
+        print(output)
+    raise RuntimeError(f"CodeQL database creation failed in container for {project_slug}")
+
+def create_codeql_database_in_container(project_slug: str, row: "BuildInfo", db_base_path: str, verbose: bool = False, extra_flags: tuple = ()) -> None:
     image = parse_project_image(project_slug)  # Parse the project image from the project slug
     ensure_image(image)
 
@@ -124,105 +326,111 @@ def create_codeql_database_in_container(project_slug: str, row: dict, db_base_pa
     db_project_slug = f"{project_slug}-docker"
 
     # Prepare host and container paths
-    host_db_dir = os.path.abspath(db_base_path)  # Create the host database directory
-    os.makedirs(host_db_dir, exist_ok=True)
-    container_codeql_dir = "/codeql"
-    container_codeql_bin = f"{container_codeql_dir}/codeql"
-    container_out_base = "/out"
-    container_db_dir = f"{container_out_base}/{db_project_slug}"
-    container_source_root = "/workspace/repo"
-
-    # Read repo info from project_info.csv
-    def get_repo_info_from_project_info(slug: str) -> tuple[str, str]:
-        with open(CVES_MAPPED_W_COMMITS_DIR, 'r') as f:
-            reader = csv.reader(f)
-            next(reader, None)  # header
-            for line in reader:
-                if len(line) > 10 and line[1] == slug:
-                    repo_url = line[8]
-                    commit_id = line[10]
-                    return repo_url, commit_id
-        raise RuntimeError(f"Project slug '{slug}' not found in project_info.csv")
+    host_db_dir = db_base_path  # Absolute and already created by main()
+    container_db_dir = f"{CONTAINER_OUT_BASE}/{db_project_slug}"
+    host_project_db_dir = os.path.join(host_db_dir, db_project_slug)
+
+    # Without bind mounts CodeQL writes to an empty directory in a fresh container, so
+    # apply its overwrite rule to the host directory the database is copied back into
+    if not USE_BIND_MOUNTS and os.path.isdir(host_project_db_dir) and os.listdir(host_project_db_dir):
+        if "--overwrite" not in extra_flags:
+            raise RuntimeError(f"Database directory {host_project_db_dir} exists and is not empty; use --force to overwrite it")
 
-    container = create_container(image=image, working_dir=container_source_root)
+    container = _start_container(image, host_db_dir)
     try:
-        container.start()
-        
-        # Copy CodeQL CLI into container and ensure out dir exists
-        copy_dir_to_container(container, CODEQL_DIR, container_codeql_dir)
-        exec_in_container(container, ["bash", "-lc", f"mkdir -p {container_out_base}"])
-
-        # Fresh fetch like fetch_one.py: reclone at desired commit
-        repo_url, commit_id = get_repo_info_from_project_info(project_slug)
-        fetch_cmd = (
-            f"rm -rf repo && mkdir -p repo && cd repo && "
-            f"git init && git remote add origin '{repo_url}' && "
-            f"git fetch --no-tags --depth 1 origin {commit_id} && "
-            f"git reset --hard FETCH_HEAD && "
-            f"git fetch --no-tags --depth 1 origin '+refs/heads/*:refs/remotes/origin/*'"
-        )
-        print(f"Refreshing sources from {repo_url} @ {commit_id}")
-        code, output = exec_in_container(
-            container,
-            ["bash", "-lc", fetch_cmd],
-            workdir="/workspace",
-            stream=verbose,
-        )
-        if code != 0:
-            if output:
-                print(output)
-            raise RuntimeError(f"Failed to fetch sources for {project_slug}")
-
-        # Apply project patch if available (mirror fetch_one.py behavior)
-        patch_dir_host = os.path.join(DATA_DIR, "patches")
-        patch_file_host = os.path.join(patch_dir_host, f"{project_slug}.patch")
-        if os.path.exists(patch_file_host):
-            print(f"Found patch for {project_slug}, applying...")
-            # Copy entire patches dir to container to keep logic simple
-            copy_dir_to_container(container, patch_dir_host, "/patches")
-            code, output = exec_in_container(
-                container,
-                ["bash", "-lc", f"git apply /patches/{project_slug}.patch"],
-                workdir=container_source_root,
-                stream=verbose,
-            )
-            if code != 0:
-                if output:
-                    print(output)
-                raise RuntimeError(f"Failed to apply patch for {project_slug}")
-        else:
-            print("No patch found; skipping patching.")
-
-        # Prefer custom build command when available
-        custom_cmd = CUSTOM_BUILD_COMMANDS.get(project_slug)
-        if custom_cmd:
-            print(f"Using custom build command for {project_slug}: {custom_cmd}")
-            codeql_cmd = (f"{container_codeql_bin} database create {container_db_dir} "
-                          f"--source-root {container_source_root} --language java --overwrite "
-                          f"--command \"{custom_cmd}\"")
-        else:
-            codeql_cmd = (f"{container_codeql_bin} database create {container_db_dir} --source-root {container_source_root} --language java --overwrite")
-
-        print(f"Initializing database at {container_db_dir}.")
-        code, output = exec_in_container(container, ["bash", "-lc", codeql_cmd], workdir=container_source_root, stream=verbose)
-        
-        if code != 0:
-            print(f"CodeQL database creation failed for {project_slug}")
-            if not verbose and output:
-                print("Error output:")
-                print(output)
-            raise RuntimeError(f"CodeQL database creation failed in container for {project_slug}")
-        
+        _build_in(container, project_slug, container_db_dir, verbose, extra_flags)
+
         print(f"Finalizing database at {container_db_dir}.")
-        # Copy database back to host  
-        copy_from_container(container, container_db_dir, host_db_dir)
+        if not USE_BIND_MOUNTS:
+            # Replace rather than merge into an existing database, then copy the new one back to host
+            shutil.rmtree(host_project_db_dir, ignore_errors=True)
+            copy_from_container(container, container_db_dir, host_db_dir)
         print(f"Successfully created database at {host_db_dir}/{db_project_slug}.")
     finally:
+        if USE_BIND_MOUNTS:
+            # CodeQL runs as root in the container; hand the bind-mounted database (even a partial one)
+            # back to the host user so later query runs and rebuilds can write to it
+            try:
+                exec_in_container(container, ["chown", "-R", f"{os.getuid()}:{os.getgid()}", container_db_dir], stream=False)
+            except Exception as e:
+                print(f"Failed to hand {host_db_dir}/{db_project_slug} back to the host user: {e}")
         try:
             container.remove(force=True)
         except Exception:
             pass
 
+def database_dir(db_base_path: str, project_slug: str, use_container: bool) -> str:
+    """Host directory the CodeQL database of `project_slug` is written to."""
+    # Databases built in a container get a -docker suffix
+    db_project_slug = f"{project_slug}-docker" if use_container else project_slug
+    return os.path.join(db_base_path, db_project_slug)
+
+def is_database_current(db_base_path: str, project_slug: str, use_container: bool) -> bool:
+    """
+    Check whether a completed CodeQL database already exists for `project_slug`.
+    CodeQL writes codeql-database.yml once the database is finalized; it must also be newer than the project patch.
+    """
+    marker = os.path.join(database_dir(db_base_path, project_slug, use_container), "codeql-database.yml")
+    if not os.path.exists(marker):
+        return False
+    patch_name = f"{project_slug}.patch"
+    if patch_name not in _PATCH_SET:
+        return True
+    patch_file = os.path.join(PATCHES_DIR, patch_name)
+    return os.path.getmtime(marker) >= os.path.getmtime(patch_file)
+
+def is_database_stale(db_base_path: str, project_slug: str, use_container: bool) -> bool:
+    """Check whether `project_slug` has a completed CodeQL database that is older than its patch."""
+    marker = os.path.join(database_dir(db_base_path, project_slug, use_container), "codeql-database.yml")
+    return os.path.exists(marker) and not is_database_current(db_base_path, project_slug, use_container)
+
+def build_project_database(project, db_path, sources_path, use_container, verbose, extra_flags=()):
+    """Build the CodeQL database of a single project, either natively or inside its container."""
+    # A completed but outdated database is replaced; a partial one without the marker still needs --force
+    if "--overwrite" not in extra_flags and is_database_stale(db_path, project.project_slug, use_container):
+        print(f"Rebuilding outdated CodeQL database of {project.project_slug}")
+        extra_flags = (*extra_flags, "--overwrite")
+    if use_container:
+        create_codeql_database_in_container(project.project_slug, project, db_path, verbose, extra_flags)
+    else:
+        env = setup_environment(project)
+        create_codeql_database(project.project_slug, env, db_path, sources_path, extra_flags, verbose)
+
+def codeql_flags(args) -> tuple:
+    """Extra `codeql database create` flags derived from the command line."""
+    flags = codeql_resource_flags(args.jobs, args.codeql_threads, args.codeql_ram)
+    # Only let CodeQL clobber an existing database directory when --force is given
+    if args.force:
+        flags.append("--overwrite")
+    return tuple(flags)
+
+def parallel_build_databases(projects, args):
+    """Build the CodeQL databases of all projects, running up to `args.jobs` builds at once."""
+    extra_flags = codeql_flags(args)
+    failed_projects = []
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        future_to_slug = {
+            executor.submit(build_project_database, project, args.db_path, args.sources_path,
+                            args.use_container, args.verbose, extra_flags): project.project_slug
+            for project in projects
+        }
+
+        # Surface failures as they happen without blocking the remaining builds
+        for future in as_completed(future_to_slug):
+            project_slug = future_to_slug[future]
+            try:
+                future.result()
+            except Exception as exc:
+                print(f">> Project {project_slug} generated an exception: {exc}")
+                failed_projects.append(project_slug)
+
+    print(f"\n====== Summary ======")
+    print(f"Successfully built: {len(projects) - len(failed_projects)}/{len(projects)}")
+    if failed_projects:
+        print(f"Failed projects: {', '.join(failed_projects)}")
+    return failed_projects
+
 def main():
     parser = argparse.ArgumentParser(description='Create CodeQL databases for cwe-bench-java projects')
     parser.add_argument('--project', help='Specific project slug', default=None)
@@ -230,54 +438,129 @@ def main():
     parser.add_argument('--sources-path', help='Base path for project sources', default=PROJECT_SOURCE_CODE_DIR)
     parser.add_argument('--use-container', action='store_true', help='Create DB inside the project container using mounted CodeQL')
     parser.add_argument('--verbose', action='store_true', help='Show verbose output during database creation')
+    parser.add_argument('--jobs', type=int, default=1, help='Number of CodeQL databases to build in parallel')
+    parser.add_argument('--codeql-threads', type=int, default=None,
+                        help='Threads per CodeQL build (default: host cores divided by --jobs)')
+    parser.add_argument('--codeql-ram', type=int, default=None,
+                        help='RAM in MB per CodeQL build (default: 80%% of available memory divided by --jobs)')
+    parser.add_argument('--skip-existing', action=argparse.BooleanOptionalAction, default=True,
+                        help='Skip projects whose CodeQL database is already built (default: on)')
+    parser.add_argument('--force', action='store_true', help='Rebuild and overwrite existing CodeQL databases')
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    # Resolve the base paths once instead of per project
+    args.db_path = os.path.abspath(args.db_path)
+    args.sources_path = os.path.abspath(args.sources_path)
+    os.makedirs(args.db_path, exist_ok=True)
 
     # Load build information
     projects = load_build_info()
 
+    def already_built(project):
+        if args.force or not args.skip_existing:
+            return False
+        if is_database_current(args.db_path, project.project_slug, args.use_container):
+            print(f"Skipping {project.project_slug}: CodeQL database already exists")
+            return True
+        return False
+
     if args.project:
-        project = next((p for p in projects if p['project_slug'] == args.project), None)
+        project = next((p for p in projects if p.project_slug == args.project), None)
         if project:
-            if args.use_container:
-                create_codeql_database_in_container(project['project_slug'], project, args.db_path, args.verbose)
-            else:
-                env = setup_environment(project)
-                create_codeql_database(project['project_slug'], env, args.db_path, args.sources_path)
+            if not already_built(project):
+                build_project_database(project, args.db_path, args.sources_path, args.use_container, args.verbose,
+                                       codeql_flags(args))
         else:
             print(f"Project {args.project} not found in CSV file")
     else:
-        for project in projects:
-            if args.use_container:
-                create_codeql_database_in_container(project['project_slug'], project, args.db_path, args.verbose)
-            else:
-                env = setup_environment(project)
-                create_codeql_database(project['project_slug'], env, args.db_path, args.sources_path)
+        projects = [p for p in projects if not already_built(p)]
+        failed_projects = parallel_build_databases(projects, args)
+        if failed_projects:
+            sys.exit(1)
 
 # Location of build_info_local.csv file
 LOCAL_BUILD_INFO = os.path.join(DATA_DIR, "build-info", "build_info_local.csv")
 
+# Successful build configuration of a project, as read from the build info CSV files
+BuildInfo = collections.namedtuple("BuildInfo", ["project_slug", "jdk_version", "mvn_version", "gradle_version"])
+
+# On-disk cache of the merged build information, keyed by the mtimes of both CSVs
+BUILD_INFO_CACHE = os.path.join(DATA_DIR, ".build_info.pkl")
+
+# Bump when the cached row format changes so stale caches are ignored
+BUILD_INFO_CACHE_VERSION = 2
+
+def _build_info_mtimes():
+    local_mtime = os.path.getmtime(LOCAL_BUILD_INFO) if os.path.exists(LOCAL_BUILD_INFO) else None
+    return (BUILD_INFO_CACHE_VERSION, local_mtime, os.path.getmtime(BUILD_INFO))
+
+@functools.lru_cache(maxsize=None)
 def load_build_info():
     """
     Merge the local and global build information. Prioritize local build info.
+    The merged result is cached in BUILD_INFO_CACHE until either CSV file changes.
     """
+    mtimes = _build_info_mtimes()
+    try:
+        with open(BUILD_INFO_CACHE, "rb") as f:
+            cached_mtimes, cached_build_info = pickle.load(f)
+        if cached_mtimes == mtimes:
+            return cached_build_info
+    except (OSError, EOFError, ValueError, AttributeError, ImportError, pickle.UnpicklingError):
+        pass
+
+    build_info = _read_build_info()
+    try:
+        tmp_path = f"{BUILD_INFO_CACHE}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((mtimes, build_info), f)
+        os.replace(tmp_path, BUILD_INFO_CACHE)
+    except OSError:
+        pass
+    return build_info
+
+def _read_build_info_csv(csv_path, build_info, override):
+    """Add the successful rows of a build info CSV to `build_info`, replacing existing entries only if `override`."""
+    with open(csv_path, "r", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        # Resolve column positions once; optional columns fall back to 'n/a' like dict.get did
+        slug_idx = header.index("project_slug")
+        jdk_idx = header.index("jdk_version")
+        status_idx = header.index("status") if "status" in header else None
+        mvn_idx = header.index("mvn_version") if "mvn_version" in header else None
+        gradle_idx = header.index("gradle_version") if "gradle_version" in header else None
+        max_idx = max(i for i in (slug_idx, jdk_idx, status_idx, mvn_idx, gradle_idx) if i is not None)
+        for row in reader:
+            # Skip blank and truncated rows, as DictReader did
+            if len(row) <= max_idx:
+                continue
+            if status_idx is not None and row[status_idx] != "success":
+                continue
+            slug = row[slug_idx]
+            if not override and slug in build_info:
+                continue
+            build_info[slug] = BuildInfo(
+                slug,
+                row[jdk_idx],
+                row[mvn_idx] if mvn_idx is not None else 'n/a',
+                row[gradle_idx] if gradle_idx is not None else 'n/a',
+            )
+
+def _read_build_info():
+    """Parse the local and global build info CSV files."""
     build_info = {}
 
     # Get the local build info
     if os.path.exists(LOCAL_BUILD_INFO):
-        with open(LOCAL_BUILD_INFO, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get("status", "success") == "success":
-                    build_info[row["project_slug"]] = row
+        _read_build_info_csv(LOCAL_BUILD_INFO, build_info, override=True)
 
     # Add the global build info if there is not local information
-    with open(BUILD_INFO, "r") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row.get("status", "success") != "success":
-                continue
-            if row["project_slug"] not in build_info:
-                build_info[row["project_slug"]] = row
+    _read_build_info_csv(BUILD_INFO, build_info, override=False)
 
     return list(build_info.values())
 
@@ -15,9 +15,18 @@ Example:
 import os
 import sys
 import csv
+import collections
+import contextlib
+import fcntl
+import hashlib
 import json
+import functools
 import argparse
+import shutil
+import signal
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
@@ -29,8 +38,11 @@ sys.path.append(str(ROOT_DIR))
 from src.config import DATA_DIR, DEP_CONFIGS
 from scripts.docker_utils import create_container, ensure_image, exec_in_container, parse_project_image
 
-# Load dependency configurations
-ALLVERSIONS = json.load(open(DEP_CONFIGS))
+@functools.lru_cache(maxsize=1)
+def _allversions():
+    """Load the dependency configurations (installed JDK/Maven/Gradle paths) once per process."""
+    with open(DEP_CONFIGS) as f:
+        return json.load(f)
 
 # Predefined build attempts
 ATTEMPTS = [
@@ -45,42 +57,183 @@ ATTEMPTS = [
     {"jdk": "17", "gradlew": 1},       # Attempt 9
 ]
 
+# Environment shared by every build command; HOME lets Maven and Gradle find ~/.m2 and ~/.gradle
+_BASE_PATH = os.environ.get("PATH", "")
+_HOME = os.environ.get("HOME", "/tmp")
+
+# Reuse a warm Gradle daemon across attempts; --ephemeral turns this off
+USE_BUILD_DAEMONS = True
+
+# Seconds a single build command may run before its process group is killed (0 disables the limit)
+BUILD_TIMEOUT_SECONDS = int(os.environ.get("IRIS_BUILD_TIMEOUT", "1800"))
+
+# Amount of build tool output kept for the failure report
+BUILD_OUTPUT_TAIL_BYTES = 256 * 1024
+
+# Per-project build configurations and the local build result log
+_BUILD_INFO_DIR = Path(DATA_DIR) / "build-info"
+_BUILD_INFO_DIR.mkdir(parents=True, exist_ok=True)
+LOCAL_BUILD_RESULTS_CSV = _BUILD_INFO_DIR / "build_info_local.csv"
+
+
+def _build_info_path(project_slug):
+    return _BUILD_INFO_DIR / f"{project_slug}.json"
+
+
+# Build outputs cached by source tree + attempt configuration. Off by default since entries are full
+# copies of target/ and build/ and are never evicted; enable with IRIS_BUILD_CACHE=1 or --build-cache
+USE_BUILD_CACHE = os.environ.get("IRIS_BUILD_CACHE") == "1"
+BUILD_CACHE_DIR = Path(DATA_DIR) / "build-cache"
+
+# Scratch copies of project sources for attempts run in parallel
+BUILD_SCRATCH_DIR = Path(DATA_DIR) / "build-scratch"
+
 # Build result constants
 NEWLY_BUILT = "newly-built"
 ALREADY_BUILT = "already-built"
 FAILED = "failed"
 
 
+def maven_thread_args(attempt):
+    """Arguments enabling Maven's parallel reactor; Maven 2 has no -T so none are returned for it."""
+    mvn_version = attempt.get("mvn", "")
+    try:
+        if mvn_version and int(mvn_version.split(".")[0]) < 3:
+            return []
+    except ValueError:
+        pass
+    return ["-T", attempt.get("mvn_threads", "1C")]
+
+
+@functools.lru_cache(maxsize=None)
+def _validated_jdk(version):
+    """Installation path of a JDK version, or None if it is not configured or its java binary is missing."""
+    path = _allversions()["jdks"].get(version)
+    if path and Path(path, "bin", "java").exists():
+        return Path(path)
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _validated_mvn(version):
+    """Installation path of a Maven version, or None if it is not configured or its mvn binary is missing."""
+    path = _allversions()["mvn"].get(version)
+    if path and Path(path, "bin", "mvn").exists():
+        return Path(path)
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _validated_gradle(version):
+    """Installation path of a Gradle version, or None if it is not configured or its gradle binary is missing."""
+    path = _allversions()["gradle"].get(version)
+    if path and Path(path, "bin", "gradle").exists():
+        return Path(path)
+    return None
+
+
+def toolchain_available(attempt):
+    """Check that every tool an attempt needs is installed on this machine."""
+    if not _validated_jdk(attempt["jdk"]):
+        return False
+    if "mvn" in attempt:
+        return _validated_mvn(attempt["mvn"]) is not None
+    if "gradle" in attempt:
+        return _validated_gradle(attempt["gradle"]) is not None
+    return True
+
+
+# Build tool processes currently running, keyed by build directory, so parallel attempts can be stopped early
+_RUNNING_BUILDS = {}
+_RUNNING_BUILDS_LOCK = threading.Lock()
+# Build directories whose builds are no longer wanted; builds starting there afterwards are stopped too
+_STOPPED_BUILD_DIRS = set()
+
+
+def _signal_process_group(proc, sig):
+    """Signal a build started by run_build_command together with every process it spawned."""
+    try:
+        # Each build runs in its own session, so its process group id is its pid
+        os.killpg(proc.pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+def terminate_builds_in(build_dirs):
+    """Terminate the builds running in `build_dirs`, and any build started there later."""
+    with _RUNNING_BUILDS_LOCK:
+        for build_dir in map(str, build_dirs):
+            _STOPPED_BUILD_DIRS.add(build_dir)
+            proc = _RUNNING_BUILDS.get(build_dir)
+            if proc is not None:
+                _signal_process_group(proc, signal.SIGTERM)
+
+
+def run_build_command(cmd, cwd, env, echo=True):
+    """
+    Run a build tool, streaming its output live (unless `echo` is false) and keeping only the last
+    BUILD_OUTPUT_TAIL_BYTES for error reporting. Raises CalledProcessError on failure,
+    or TimeoutExpired if it was killed after BUILD_TIMEOUT_SECONDS.
+    """
+    tail = bytearray()
+    timed_out = threading.Event()
+    sys.stdout.flush()
+    with subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          bufsize=1024 * 1024, start_new_session=True) as proc:
+        with _RUNNING_BUILDS_LOCK:
+            _RUNNING_BUILDS[str(cwd)] = proc
+            if str(cwd) in _STOPPED_BUILD_DIRS:
+                _signal_process_group(proc, signal.SIGTERM)
+
+        def kill_on_timeout():
+            timed_out.set()
+            _signal_process_group(proc, signal.SIGKILL)
+
+        # Killing the whole group closes the output pipe, which ends the read loop below
+        timer = threading.Timer(BUILD_TIMEOUT_SECONDS, kill_on_timeout) if BUILD_TIMEOUT_SECONDS > 0 else None
+        if timer:
+            timer.daemon = True
+            timer.start()
+        try:
+            for chunk in iter(lambda: proc.stdout.read1(64 * 1024), b""):
+                if echo:
+                    sys.stdout.buffer.write(chunk)
+                    sys.stdout.buffer.flush()
+                tail += chunk
+                if len(tail) > 2 * BUILD_OUTPUT_TAIL_BYTES:
+                    del tail[:-BUILD_OUTPUT_TAIL_BYTES]
+        except BaseException:
+            # The build runs in its own session, so Ctrl-C does not reach it; do not leave it orphaned
+            _signal_process_group(proc, signal.SIGKILL)
+            raise
+        finally:
+            if timer:
+                timer.cancel()
+            with _RUNNING_BUILDS_LOCK:
+                _RUNNING_BUILDS.pop(str(cwd), None)
+    output = bytes(tail[-BUILD_OUTPUT_TAIL_BYTES:]).decode(errors="ignore")
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, BUILD_TIMEOUT_SECONDS, output=output)
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=output)
+    return output
+
+
 def is_built(project_slug):
     """Check if a project has already been built."""
-    build_info_path = Path(DATA_DIR) / "build-info" / f"{project_slug}.json"
-    return build_info_path.exists()
+    return _build_info_path(project_slug).exists()
 
 
 def save_build_info(project_slug, attempt):
     """Save build configuration information to JSON file."""
-    build_info_path = Path(DATA_DIR) / "build-info" / f"{project_slug}.json"
-    build_info_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(build_info_path, 'w') as f:
+    with open(_build_info_path(project_slug), 'w') as f:
         json.dump(attempt, f, indent=2)
 
 
 def save_local_build_result(project_slug, success, attempt):
     """Save build result to local CSV file for tracking."""
-    build_result_path = Path(DATA_DIR) / "build-info" / "build_info_local.csv"
-    build_result_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Read existing data
-    rows = []
-    if build_result_path.exists():
-        with open(build_result_path, 'r') as f:
-            reader = csv.reader(f)
-            rows = list(reader)[1:]  # Skip header
-    
-    # Add new row
     timestamp = datetime.now().strftime("%Y-%m-%d-%H:%M:%S")
-    rows.append([
+    row = [
         timestamp,
         project_slug,
         "success" if success else "failure",
@@ -88,13 +241,51 @@ def save_local_build_result(project_slug, success, attempt):
         attempt.get("mvn", "n/a"),
         attempt.get("gradle", "n/a"),
         attempt.get("gradlew", "n/a"),
-    ])
+    ]
     
-    # Write back to file
-    with open(build_result_path, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(["timestamp", "project_slug", "status", "jdk_version", "mvn_version", "gradle_version", "use_gradlew"])
-        writer.writerows(rows)
+    # Append only the new row; the lock keeps parallel build_one.py runs from interleaving writes
+    with open(LOCAL_BUILD_RESULTS_CSV, 'a', newline='') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            writer = csv.writer(f)
+            # Write the header only when this call creates the file
+            if f.seek(0, os.SEEK_END) == 0:
+                writer.writerow(["timestamp", "project_slug", "status", "jdk_version", "mvn_version", "gradle_version", "use_gradlew"])
+            writer.writerow(row)
+            f.flush()
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_csv_index(csv_path, mtime):
+    """
+    Index the successful build configurations of a build info CSV by project slug.
+    `mtime` is only part of the cache key, so an edited file is re-read.
+    """
+    index = {}
+    with open(csv_path) as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            if row['status'] != 'success' or row['project_slug'] in index:
+                continue
+            specific_attempt = {}
+            if row['jdk_version'] not in ('n/a', '', None):
+                specific_attempt['jdk'] = row['jdk_version']
+            if row['mvn_version'] not in ('n/a', '', None):
+                specific_attempt['mvn'] = row['mvn_version']
+            if row['gradle_version'] not in ('n/a', '', None):
+                specific_attempt['gradle'] = row['gradle_version']
+            if row['use_gradlew'] != 'n/a':
+                if row['use_gradlew'] == "True":
+                    specific_attempt['gradlew'] = 1
+                else:
+                    specific_attempt['gradlew'] = 0
+
+            # Check if we have a JDK and a build tool configuration
+            if 'jdk' in specific_attempt and any(key in specific_attempt for key in ['mvn', 'gradle', 'gradlew']):
+                index[row['project_slug']] = specific_attempt
+    return index
 
 
 def get_build_info_from_csv(project_slug, csv_path):
@@ -104,216 +295,354 @@ def get_build_info_from_csv(project_slug, csv_path):
     
     print(f"[build_one] Checking build info from {csv_path}")
     try:
-        with open(csv_path) as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row['project_slug'] == project_slug and row['status'] == 'success':
-                    specific_attempt = {}
-                    if row['jdk_version'] not in ('n/a', '', None):
-                        specific_attempt['jdk'] = row['jdk_version']
-                    if row['mvn_version'] not in ('n/a', '', None):
-                        specific_attempt['mvn'] = row['mvn_version']
-                    if row['gradle_version'] not in ('n/a', '', None):
-                        specific_attempt['gradle'] = row['gradle_version']
-                    if row['use_gradlew'] != 'n/a':
-                        if row['use_gradlew'] == "True":
-                            specific_attempt['gradlew'] = 1
-                        else:
-                            specific_attempt['gradlew'] = 0
-
-                    # Check if we have a JDK and a build tool configuration
-                    if 'jdk' in specific_attempt and any(key in specific_attempt for key in ['mvn', 'gradle', 'gradlew']):
-                        print(f"[build_one] Found successful build configuration: {specific_attempt}")
-                        return specific_attempt
+        specific_attempt = _load_csv_index(str(csv_path), os.path.getmtime(csv_path)).get(project_slug)
+        if specific_attempt:
+            print(f"[build_one] Found successful build configuration: {specific_attempt}")
+            return dict(specific_attempt)
     except Exception as e:
         print(f"[build_one] Failed to read or use build info from CSV: {str(e)}")
     
     return None
 
 
-def build_with_maven(project_slug, attempt):
-    """Build project using Maven."""
-    target_dir = Path(DATA_DIR) / "project-sources" / project_slug
-    
-    jdk_version = attempt['jdk']
-    mvn_version = attempt['mvn']
-    
-    print(f"[build_one] Building {project_slug} with Maven {mvn_version} and JDK {jdk_version}...")
-    
-    # Validate paths
-    java_path = ALLVERSIONS["jdks"].get(jdk_version)
-    maven_path = ALLVERSIONS["mvn"].get(mvn_version)
-    
-    if not java_path or not maven_path:
-        print(f"[build_one] JDK {jdk_version} or Maven {mvn_version} not found in available installations.")
-        return FAILED
-    
-    if not Path(java_path).exists() or not Path(maven_path).exists():
-        print(f"[build_one] JDK {jdk_version} or Maven {mvn_version} not found in filesystem.")
-        return FAILED
-    
-    if not Path(java_path, "bin", "java").exists() or not Path(maven_path, "bin", "mvn").exists():
-        print(f"[build_one] JDK {jdk_version} or Maven {mvn_version} binaries not found.")
-        return FAILED
-    
-    print(f"[build_one] JAVA_PATH: {java_path}")
+def _locate_maven(attempt, target_dir):
+    maven_path = _validated_mvn(attempt["mvn"])
+    if not maven_path:
+        print(f"[build_one] Maven {attempt['mvn']} not found in available installations.")
+        return None
     print(f"[build_one] MAVEN_PATH: {maven_path}")
-    
-    # Maven build command
-    mvn_cmd = [
-        "mvn", "clean", "package", "-B", "-V", "-e",
+    return maven_path / "bin"
+
+
+def _maven_command(attempt, bin_dir):
+    return [
+        "mvn", *maven_thread_args(attempt), "clean", "package", "-B", "-V", "-e",
         "-Dfindbugs.skip", "-Dcheckstyle.skip", "-Dpmd.skip=true",
         "-Dspotbugs.skip", "-Denforcer.skip", "-Dmaven.javadoc.skip",
         "-DskipTests", "-Dmaven.test.skip.exec", "-Dlicense.skip=true",
         "-Drat.skip=true", "-Dspotless.check.skip=true"
     ]
-    
-    try:
-        result = subprocess.run(
-            mvn_cmd,
-            cwd=target_dir,
-            env={
-                "PATH": f"{os.environ['PATH']}:{maven_path}/bin",
-                "JAVA_HOME": java_path,
-            },
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        print(f"[build_one] Build succeeded for {project_slug} with Maven {mvn_version} and JDK {jdk_version}")
-        save_build_info(project_slug, attempt)
-        return NEWLY_BUILT
-        
-    except subprocess.CalledProcessError as e:
-        print(f"[build_one] Build failed for {project_slug} with Maven {mvn_version} and JDK {jdk_version}")
-        print(f"Return code: {e.returncode}")
-        print(f"Stdout: {e.stdout}")
-        print(f"Stderr: {e.stderr}")
-        return FAILED
 
 
-def build_with_gradle(project_slug, attempt):
-    """Build project using Gradle."""
-    target_dir = Path(DATA_DIR) / "project-sources" / project_slug
-    
-    jdk_version = attempt['jdk']
-    gradle_version = attempt['gradle']
-    
-    print(f"[build_one] Building {project_slug} with Gradle {gradle_version} and JDK {jdk_version}...")
-    
-    # Validate paths
-    java_path = ALLVERSIONS["jdks"].get(jdk_version)
-    gradle_path = ALLVERSIONS["gradle"].get(gradle_version)
-    
-    if not java_path or not gradle_path:
-        print(f"[build_one] JDK {jdk_version} or Gradle {gradle_version} not found in available installations.")
-        return FAILED
-    
-    if not Path(java_path).exists() or not Path(gradle_path).exists():
-        print(f"[build_one] JDK {jdk_version} or Gradle {gradle_version} not found in filesystem.")
-        return FAILED
-    
-    # Gradle build command
-    gradle_cmd = ["gradle", "build", "--parallel"]
-    
-    try:
-        result = subprocess.run(
-            gradle_cmd,
-            cwd=target_dir,
-            env={
-                "PATH": f"{os.environ['PATH']}:{gradle_path}/bin",
-                "JAVA_HOME": java_path,
-            },
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        print(f"[build_one] Build succeeded for {project_slug} with Gradle {gradle_version} and JDK {jdk_version}")
-        save_build_info(project_slug, attempt)
-        return NEWLY_BUILT
-        
-    except subprocess.CalledProcessError as e:
-        print(f"[build_one] Build failed for {project_slug} with Gradle {gradle_version} and JDK {jdk_version}")
-        print(f"Return code: {e.returncode}")
-        print(f"Stdout: {e.stdout}")
-        print(f"Stderr: {e.stderr}")
-        return FAILED
+def _locate_gradle(attempt, target_dir):
+    gradle_path = _validated_gradle(attempt["gradle"])
+    if not gradle_path:
+        print(f"[build_one] Gradle {attempt['gradle']} not found in available installations.")
+        return None
+    return gradle_path / "bin"
 
 
-def build_with_gradlew(project_slug, attempt):
-    """Build project using gradlew script."""
-    target_dir = Path(DATA_DIR) / "project-sources" / project_slug
+def _gradle_command(attempt, bin_dir):
+    return ["gradle", "build", "--parallel", "--daemon" if USE_BUILD_DAEMONS else "--no-daemon"]
+
+
+def _locate_gradlew(attempt, target_dir):
     gradlew_path = target_dir / "gradlew"
-    
-    jdk_version = attempt['jdk']
-    
-    print(f"[build_one] Building {project_slug} with gradlew and JDK {jdk_version}...")
-    
     if not gradlew_path.exists():
         print(f"[build_one] gradlew script not found in {target_dir}")
-        return FAILED
+        return None
     
     # Make gradlew executable
     try:
-        subprocess.run(["chmod", "+x", str(gradlew_path)], check=True)
-    except subprocess.CalledProcessError as e:
+        gradlew_path.chmod(gradlew_path.stat().st_mode | 0o111)
+    except OSError as e:
         print(f"[build_one] Failed to make gradlew executable: {e}")
-        return FAILED
+        return None
+    # The wrapper brings its own Gradle, so nothing is added to PATH
+    return ""
+
+
+def _gradlew_command(attempt, bin_dir):
+    return ["./gradlew", "--daemon" if USE_BUILD_DAEMONS else "--no-daemon", "-S", "-Dorg.gradle.dependency.verification=off", "clean"]
+
+
+# How to run each build tool:
+# - name, and the attempt key holding its version (None if it has none)
+# - locate(attempt, target_dir): directory to add to PATH ("" for none), or None if the tool is unusable
+# - command(attempt, bin_dir): the build command line
+# - lock: held while the tool runs, or None if concurrent runs are safe
+BuildTool = collections.namedtuple("BuildTool", ["name", "version_key", "locate", "command", "lock"])
+
+# Maven's local repository (~/.m2) is not safe for concurrent downloads, so parallel attempts
+# in this process run Maven one at a time; Gradle locks its own caches across processes.
+# Separate build_one.py processes are not coordinated, which is why parallel attempts are opt-in.
+_MAVEN_REPO_LOCK = threading.Lock()
+
+# Checked in order; the first key present in an attempt selects its tool
+TOOLS = {
+    "mvn": BuildTool("Maven", "mvn", _locate_maven, _maven_command, _MAVEN_REPO_LOCK),
+    "gradle": BuildTool("Gradle", "gradle", _locate_gradle, _gradle_command, None),
+    "gradlew": BuildTool("gradlew", None, _locate_gradlew, _gradlew_command, None),
+}
+
+
+def _run_build(tool, project_slug, attempt, target_dir, echo=True):
+    """
+    Build project in `target_dir` with a build tool from TOOLS.
+    Returns (result, output tail). The output is streamed live when `echo` is true and
+    otherwise left for the caller to report.
+    """
+    jdk_version = attempt['jdk']
+    tool_label = f"{tool.name} {attempt[tool.version_key]}" if tool.version_key else tool.name
     
-    # Validate Java path
-    java_path = ALLVERSIONS["jdks"].get(jdk_version)
-    if not java_path or not Path(java_path).exists():
-        print(f"[build_one] JDK {jdk_version} not found.")
-        return FAILED
+    print(f"[build_one] Building {project_slug} with {tool_label} and JDK {jdk_version}...")
     
-    # Gradlew build command
-    gradlew_cmd = ["./gradlew", "--no-daemon", "-S", "-Dorg.gradle.dependency.verification=off", "clean"]
+    # Validate paths
+    java_path = _validated_jdk(jdk_version)
+    if not java_path:
+        print(f"[build_one] JDK {jdk_version} not found in available installations.")
+        return FAILED, ""
+    print(f"[build_one] JAVA_PATH: {java_path}")
+    
+    bin_dir = tool.locate(attempt, target_dir)
+    if bin_dir is None:
+        return FAILED, ""
     
     try:
-        result = subprocess.run(
-            gradlew_cmd,
-            cwd=target_dir,
-            env={"JAVA_HOME": java_path},
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        print(f"[build_one] Build succeeded for {project_slug} with gradlew and JDK {jdk_version}")
-        save_build_info(project_slug, {"gradlew": 1, "jdk": jdk_version})
-        return NEWLY_BUILT
+        with tool.lock or contextlib.nullcontext():
+            output = run_build_command(
+                tool.command(attempt, bin_dir),
+                cwd=target_dir,
+                env={
+                    "PATH": f"{_BASE_PATH}:{bin_dir}" if bin_dir else _BASE_PATH,
+                    "JAVA_HOME": str(java_path),
+                    "HOME": _HOME,
+                },
+                echo=echo,
+            )
+        print(f"[build_one] Build succeeded for {project_slug} with {tool_label} and JDK {jdk_version}")
+        return NEWLY_BUILT, output
         
     except subprocess.CalledProcessError as e:
-        print(f"[build_one] Build failed for {project_slug} with gradlew and JDK {jdk_version}")
+        print(f"[build_one] Build failed for {project_slug} with {tool_label} and JDK {jdk_version}")
         print(f"Return code: {e.returncode}")
-        print(f"Stdout: {e.stdout}")
-        print(f"Stderr: {e.stderr}")
-        return FAILED
+        return FAILED, e.output
+    
+    except subprocess.TimeoutExpired as e:
+        print(f"[build_one] Build timed out after {e.timeout}s for {project_slug} with {tool_label} and JDK {jdk_version}")
+        return FAILED, e.output
+
+
+def _output_dir_names(files):
+    """Names of the build output directories next to a directory's build files."""
+    names = set()
+    if "pom.xml" in files:
+        names.add("target")
+    if "build.gradle" in files or "build.gradle.kts" in files:
+        names.add("build")
+    return names
+
+
+def _pruned_dirs(files, dirs):
+    """Subdirectories of a directory that hold VCS metadata, tool caches or build outputs."""
+    return {d for d in dirs if d in (".git", ".gradle")} | (_output_dir_names(files) & set(dirs))
+
+
+def _walk_sources(src_dir):
+    """
+    Walk a project tree in a stable order, skipping VCS metadata and build outputs.
+    Yields (root, files, output_dirs) where output_dirs are the pruned output directories of `root`.
+    """
+    for root, dirs, files in os.walk(src_dir):
+        output_dirs = _output_dir_names(files) & set(dirs)
+        pruned = _pruned_dirs(files, dirs)
+        dirs[:] = sorted(d for d in dirs if d not in pruned)
+        yield root, sorted(files), sorted(output_dirs)
+
+
+def _ignore_output_dirs(directory, names):
+    """
+    shutil.copytree `ignore` callback skipping stale build output directories.
+    VCS metadata is kept since builds may read it (git-commit-id, buildnumber, `git describe`).
+    """
+    dirs = [name for name in names if os.path.isdir(os.path.join(directory, name))]
+    return _output_dir_names(names) & set(dirs)
+
+
+def _move_build_outputs(src_dir, dest_dir):
+    """Move the build output directories of `src_dir` to the same places under `dest_dir`, replacing stale ones."""
+    for root, _, output_dirs in _walk_sources(src_dir):
+        for name in output_dirs:
+            src = Path(root, name)
+            dest = Path(dest_dir) / src.relative_to(src_dir)
+            shutil.rmtree(dest, ignore_errors=True)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(src), str(dest))
+
+
+def _tree_hash(src_dir):
+    """Content hash of a project's sources, ignoring VCS metadata and build outputs."""
+    digest = hashlib.blake2b()
+    for root, files, _ in _walk_sources(src_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, src_dir).encode())
+            digest.update(b"\0")
+            if os.path.islink(path):
+                digest.update(os.readlink(path).encode())
+            else:
+                with open(path, "rb") as f:
+                    for block in iter(lambda: f.read(1024 * 1024), b""):
+                        digest.update(block)
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def build_cache_key(tree_hash, attempt):
+    """Cache key of a build: the source tree hash combined with the attempt configuration."""
+    digest = hashlib.blake2b(tree_hash.encode())
+    digest.update(json.dumps(attempt, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def restore_build_outputs(target_dir, cache_key):
+    """Copy cached build outputs into a project tree. Returns False on a cache miss."""
+    cache_entry = BUILD_CACHE_DIR / cache_key
+    if not cache_entry.is_dir():
+        return False
+    shutil.copytree(cache_entry, target_dir, symlinks=True, dirs_exist_ok=True)
+    return True
 
 
-def build_project_with_attempt(project_slug, attempt):
-    """Build project using a specific attempt configuration."""
-    # Check if already built
+def store_build_outputs(target_dir, cache_key):
+    """Copy the build outputs of a successful build in `target_dir` into the cache."""
+    cache_entry = BUILD_CACHE_DIR / cache_key
+    if cache_entry.exists():
+        return
+    tmp_entry = BUILD_CACHE_DIR / f".{cache_key}.{os.getpid()}.tmp"
+    try:
+        for root, _, output_dirs in _walk_sources(target_dir):
+            for name in output_dirs:
+                src = Path(root, name)
+                # Copy rather than hardlink: incremental builds may rewrite outputs in place
+                shutil.copytree(src, tmp_entry / src.relative_to(target_dir), symlinks=True)
+        tmp_entry.mkdir(parents=True, exist_ok=True)
+        os.rename(tmp_entry, cache_entry)
+    except OSError as e:
+        print(f"[build_one] Failed to cache build outputs of {target_dir}: {e}")
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+
+
+def build_project_with_attempt(project_slug, attempt, tree_hash=None):
+    """
+    Build project using a specific attempt configuration.
+    `tree_hash` is the project's _tree_hash, if the caller already computed it for the build cache.
+    """
+    # Safety net for callers that bypass build_project's early check
     if is_built(project_slug):
         print(f"[build_one] {project_slug} is already built...")
         return ALREADY_BUILT
     
-    # Choose build method based on attempt configuration
-    if "mvn" in attempt:
-        return build_with_maven(project_slug, attempt)
-    elif "gradle" in attempt:
-        return build_with_gradle(project_slug, attempt)
-    elif "gradlew" in attempt:
-        return build_with_gradlew(project_slug, attempt)
+    target_dir = Path(DATA_DIR) / "project-sources" / project_slug
+    if not USE_BUILD_CACHE:
+        result, _ = build_in_dir(project_slug, attempt, target_dir)
     else:
-        raise ValueError("Invalid attempt configuration: must specify mvn, gradle, or gradlew")
+        # Reuse the outputs of an identical earlier build of the same sources
+        cache_key = build_cache_key(tree_hash or _tree_hash(target_dir), attempt)
+        if restore_build_outputs(target_dir, cache_key):
+            print(f"[build_one] Restored cached build outputs for {project_slug} ({cache_key[:12]})")
+            result = NEWLY_BUILT
+        else:
+            result, _ = build_in_dir(project_slug, attempt, target_dir)
+            if result == NEWLY_BUILT:
+                store_build_outputs(target_dir, cache_key)
+    
+    if result == NEWLY_BUILT:
+        save_build_info(project_slug, attempt)
+    return result
+
+
+def build_in_dir(project_slug, attempt, target_dir, echo=True):
+    """Run the build tool of an attempt configuration in `target_dir`. Returns (result, output tail)."""
+    # Choose build tool based on attempt configuration
+    for key, tool in TOOLS.items():
+        if key in attempt:
+            return _run_build(tool, project_slug, attempt, target_dir, echo)
+    raise ValueError("Invalid attempt configuration: must specify mvn, gradle, or gradlew")
+
+
+def build_attempt_in_scratch(project_slug, attempt, scratch_dir):
+    """
+    Build a copy of the project's sources with one attempt configuration, without echoing its output.
+    The copy is removed unless the build succeeds. Returns (result, output tail).
+    """
+    target_dir = Path(DATA_DIR) / "project-sources" / project_slug
+    # Leave out stale build outputs; the build recreates them
+    shutil.copytree(target_dir, scratch_dir, symlinks=True, ignore=_ignore_output_dirs)
+    result, output = FAILED, ""
+    try:
+        result, output = build_in_dir(project_slug, attempt, scratch_dir, echo=False)
+        return result, output
+    finally:
+        if result != NEWLY_BUILT:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def try_attempts_in_parallel(project_slug, attempts, max_workers, tree_hash=None):
+    """
+    Run attempts concurrently in scratch copies of the project. The successful attempt
+    that comes first in `attempts` wins, as it would when trying them in order; later
+    attempts are stopped once it succeeds. The winner's outputs are moved into the
+    project tree and results are recorded as by try_build_with_attempt.
+    Returns True if an attempt succeeded.
+    """
+    target_dir = Path(DATA_DIR) / "project-sources" / project_slug
+    scratch_base = BUILD_SCRATCH_DIR / f"{project_slug}.{os.getpid()}"
+    scratch_dirs = [scratch_base / f"attempt_{i}" for i in range(len(attempts))]
+    results = [None] * len(attempts)
+    winner = None
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(build_attempt_in_scratch, project_slug, attempt, scratch_dirs[i]): i
+                for i, attempt in enumerate(attempts)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    print(f"[build_one] Attempt {attempts[i]} raised an error: {e}")
+                    results[i] = (FAILED, "")
+                if results[i][0] == NEWLY_BUILT and (winner is None or i < winner):
+                    winner = i
+                    # Later attempts can no longer win
+                    for other, j in futures.items():
+                        if j > i:
+                            other.cancel()
+                    terminate_builds_in(scratch_dirs[i + 1:])
+                # Done once every attempt before the winner has failed
+                if winner is not None and all(results[:winner]):
+                    break
+        
+        # Report in attempt order so the log reads like the sequential loop
+        for i in range(len(attempts) if winner is None else winner):
+            result, output = results[i]
+            print(f"[build_one] Attempt {attempts[i]} failed. Output (tail):\n{output}")
+            save_local_build_result(project_slug, False, attempts[i])
+        if winner is None:
+            return False
+        
+        attempt = attempts[winner]
+        print(f"[build_one] Attempt {attempt} succeeded. Output (tail):\n{results[winner][1]}")
+        _move_build_outputs(scratch_dirs[winner], target_dir)
+        if USE_BUILD_CACHE:
+            store_build_outputs(target_dir, build_cache_key(tree_hash or _tree_hash(target_dir), attempt))
+        save_build_info(project_slug, attempt)
+        save_local_build_result(project_slug, True, attempt)
+        return True
+    finally:
+        with _RUNNING_BUILDS_LOCK:
+            _STOPPED_BUILD_DIRS.difference_update(map(str, scratch_dirs))
+        shutil.rmtree(scratch_base, ignore_errors=True)
 
 
-def try_build_with_attempt(project_slug, attempt, attempt_source=""):
+def try_build_with_attempt(project_slug, attempt, attempt_source="", tree_hash=None):
     """Try to build a project with a specific attempt configuration."""
     if attempt_source:
         print(f"[build_one] Using {attempt_source} build configuration: {attempt}")
     
-    result = build_project_with_attempt(project_slug, attempt)
+    result = build_project_with_attempt(project_slug, attempt, tree_hash)
     if result == NEWLY_BUILT:
         save_local_build_result(project_slug, True, attempt)
         return True
@@ -331,8 +660,8 @@ def validate_and_create_custom_attempt(jdk, mvn, gradle, gradlew):
         sys.exit(1)
     
     # Validate JDK version
-    if jdk not in ALLVERSIONS["jdks"]:
-        available_jdks = list(ALLVERSIONS["jdks"].keys())
+    if jdk not in _allversions()["jdks"]:
+        available_jdks = list(_allversions()["jdks"].keys())
         print(f"[build_one] Error: JDK version '{jdk}' not found. Available JDK versions: {available_jdks}")
         sys.exit(1)
     
@@ -341,8 +670,8 @@ def validate_and_create_custom_attempt(jdk, mvn, gradle, gradlew):
     
     # Validate and add Maven if specified
     if mvn:
-        if mvn not in ALLVERSIONS["mvn"]:
-            available_mvn = list(ALLVERSIONS["mvn"].keys())
+        if mvn not in _allversions()["mvn"]:
+            available_mvn = list(_allversions()["mvn"].keys())
             print(f"[build_one] Error: Maven version '{mvn}' not found. Available Maven versions: {available_mvn}")
             sys.exit(1)
         custom_attempt["mvn"] = mvn
@@ -350,8 +679,8 @@ def validate_and_create_custom_attempt(jdk, mvn, gradle, gradlew):
     
     # Validate and add Gradle if specified
     if gradle:
-        if gradle not in ALLVERSIONS["gradle"]:
-            available_gradle = list(ALLVERSIONS["gradle"].keys())
+        if gradle not in _allversions()["gradle"]:
+            available_gradle = list(_allversions()["gradle"].keys())
             print(f"[build_one] Error: Gradle version '{gradle}' not found. Available Gradle versions: {available_gradle}")
             sys.exit(1)
         custom_attempt["gradle"] = gradle
@@ -382,7 +711,7 @@ def build_inside_container(project_slug: str, attempt: dict) -> bool:
         env = {}
         cmd: list[str]
         if "mvn" in attempt:
-            cmd = ["bash", "-lc", "mvn -B -e -U -DskipTests clean package"]
+            cmd = ["bash", "-lc", " ".join(["mvn", *maven_thread_args(attempt), "-B -e -U -DskipTests clean package"])]
         elif "gradle" in attempt:
             cmd = ["bash", "-lc", "gradle build --parallel"]
         elif "gradlew" in attempt:
@@ -398,11 +727,22 @@ def build_inside_container(project_slug: str, attempt: dict) -> bool:
             pass
 
 
-def build_project(project_slug, try_all=False, custom_attempt=None, use_container: bool = False):
+def build_project(project_slug, try_all=False, custom_attempt=None, use_container: bool = False, attempt_workers=1):
     """Main function to build a project with various strategies."""
+    # Reuse a previous local build before touching any CSV or Docker state.
+    # Container builds do not record build info, so they always run.
+    if not use_container and is_built(project_slug):
+        print(f"[build_one] {project_slug} already built, skipping")
+        return True
+
+    # Hash the sources once for every cache lookup below
+    tree_hash = None
+    if USE_BUILD_CACHE and not use_container:
+        tree_hash = _tree_hash(Path(DATA_DIR) / "project-sources" / project_slug)
+
     # Handle custom attempt first
     if custom_attempt:
-        if try_build_with_attempt(project_slug, custom_attempt, "custom"):
+        if try_build_with_attempt(project_slug, custom_attempt, "custom", tree_hash):
             return True
         print(f"[build_one] Custom build configuration failed for {project_slug}")
         return False
@@ -410,13 +750,13 @@ def build_project(project_slug, try_all=False, custom_attempt=None, use_containe
     # Try known configurations unless try_all is True
     if not try_all:
         # Try local build info first
-        local_build_info = get_build_info_from_csv(project_slug, f"{DATA_DIR}/build-info/build_info_local.csv")
-        if local_build_info and (try_build_with_attempt(project_slug, local_build_info, "local") if not use_container else build_inside_container(project_slug, local_build_info)):
+        local_build_info = get_build_info_from_csv(project_slug, LOCAL_BUILD_RESULTS_CSV)
+        if local_build_info and (try_build_with_attempt(project_slug, local_build_info, "local", tree_hash) if not use_container else build_inside_container(project_slug, local_build_info)):
             return True
         
         # Try global build info if local failed
         global_build_info = get_build_info_from_csv(project_slug, f"{DATA_DIR}/build_info.csv")
-        if global_build_info and (try_build_with_attempt(project_slug, global_build_info, "global") if not use_container else build_inside_container(project_slug, global_build_info)):
+        if global_build_info and (try_build_with_attempt(project_slug, global_build_info, "global", tree_hash) if not use_container else build_inside_container(project_slug, global_build_info)):
             return True
 
     # Try all default attempts
@@ -424,9 +764,24 @@ def build_project(project_slug, try_all=False, custom_attempt=None, use_containe
           ("Skipping build info check and trying all version combinations..." if try_all else 
            "No successful build configuration found in CSV files, trying all version combinations..."))
 
-    for attempt in ATTEMPTS:
-        if (try_build_with_attempt(project_slug, attempt) if not use_container else build_inside_container(project_slug, attempt)):
+    attempts = ATTEMPTS
+    if not use_container:
+        # Skip attempts whose toolchain is not installed; the container images bring their own
+        attempts = [attempt for attempt in ATTEMPTS if toolchain_available(attempt)]
+        for attempt in ATTEMPTS:
+            if attempt not in attempts:
+                print(f"[build_one] Skipping attempt {attempt}: toolchain not installed")
+
+    # Container builds all go through the one Docker daemon, so they stay sequential
+    workers = 1 if use_container else min(len(attempts), attempt_workers)
+    if workers > 1:
+        print(f"[build_one] Trying {len(attempts)} attempts with {workers} in parallel...")
+        if try_attempts_in_parallel(project_slug, attempts, workers, tree_hash):
             return True
+    else:
+        for attempt in attempts:
+            if (try_build_with_attempt(project_slug, attempt, tree_hash=tree_hash) if not use_container else build_inside_container(project_slug, attempt)):
+                return True
     
     print(f"[build_one] All build attempts failed for {project_slug}")
     return False
@@ -482,9 +837,31 @@ Examples:
         action="store_true",
         help="Build inside the project's container image",
     )
+    parser.add_argument(
+        "--build-cache",
+        action="store_true",
+        help="Reuse and store build outputs in data/build-cache (also enabled by IRIS_BUILD_CACHE=1)",
+    )
+    parser.add_argument(
+        "--ephemeral",
+        action="store_true",
+        help="Do not start or reuse Gradle daemons",
+    )
+    parser.add_argument(
+        "--attempt-jobs",
+        type=int,
+        default=1,
+        help="Number of build attempts to run in parallel, each in its own copy of the sources (default: 1, sequential)",
+    )
     
     args = parser.parse_args()
     
+    global USE_BUILD_DAEMONS, USE_BUILD_CACHE
+    if args.ephemeral:
+        USE_BUILD_DAEMONS = False
+    if args.build_cache:
+        USE_BUILD_CACHE = True
+    
     # Check if custom versions are specified
     custom_attempt = None
     if args.jdk or args.mvn or args.gradle or args.gradlew:
@@ -493,7 +870,7 @@ Examples:
             return 1
         custom_attempt = validate_and_create_custom_attempt(args.jdk, args.mvn, args.gradle, args.gradlew)
     
-    success = build_project(args.project_slug, try_all=args.try_all, custom_attempt=custom_attempt, use_container=args.use_container)
+    success = build_project(args.project_slug, try_all=args.try_all, custom_attempt=custom_attempt, use_container=args.use_container, attempt_workers=args.attempt_jobs)
     return 0 if success else 1
 
 
@@ -1,19 +1,53 @@
+import functools
 import os
+import sys
+import threading
 import tarfile
 import io
-from typing import Dict, List, Optional, Tuple
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
 
 import docker
 from docker.errors import APIError, ImageNotFound
 
 
+@functools.lru_cache(maxsize=1)
 def get_client() -> docker.DockerClient:
+    """Return the process-wide Docker client, connecting on first use."""
     docker_host = os.environ.get("DOCKER_HOST")
     if docker_host:
         return docker.DockerClient(base_url=docker_host)
     return docker.from_env()
 
 
+# A forked child (e.g. a process-pool worker) must not share the parent's daemon connection
+os.register_at_fork(after_in_child=get_client.cache_clear)
+
+
+def close_client() -> None:
+    """Close the cached Docker client, if one was created; the next get_client() reconnects."""
+    if get_client.cache_info().currsize:
+        get_client().close()
+    get_client.cache_clear()
+
+
+# Flush echoed container output to the terminal every this many chunks
+_FLUSH_EVERY_CHUNKS = 64
+
+
+def _echo(chunk: bytes) -> None:
+    """Write raw container output to stdout without a decode/print round-trip per chunk."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is not None:
+        buffer.write(chunk)
+    else:
+        sys.stdout.write(chunk.decode(errors="ignore"))
+
+
+# Images known to be present locally, so repeated ensure_image calls skip the daemon round-trip
+_PRESENT_IMAGES: Set[str] = set()
+
+
 def pull_image(image: str) -> None:
     client = get_client()
     try:
@@ -22,13 +56,16 @@ def pull_image(image: str) -> None:
         raise
     except APIError as e:
         raise RuntimeError(f"Failed to pull image {image}: {e}")
+    _PRESENT_IMAGES.add(image)
 
 
 def ensure_image(image: str) -> None:
+    if image in _PRESENT_IMAGES:
+        return
     client = get_client()
     try:
         client.images.get(image)
-        return
+        _PRESENT_IMAGES.add(image)
     except ImageNotFound:
         pull_image(image)
 
@@ -77,12 +114,17 @@ def run_container(image: str,
         if stream_logs:
             logs_iter = container.logs(stream=True, follow=True)
             output_chunks: List[bytes] = []
+            # Flush pending text output so it is not reordered with the raw bytes below
+            sys.stdout.flush()
             for chunk in logs_iter:
+                output_chunks.append(chunk)
                 try:
-                    print(chunk.decode(errors="ignore"), end="")
+                    _echo(chunk)
+                    if len(output_chunks) % _FLUSH_EVERY_CHUNKS == 0:
+                        sys.stdout.flush()
                 except Exception:
                     pass
-                output_chunks.append(chunk)
+            sys.stdout.flush()
             output = b"".join(output_chunks).decode(errors="ignore")
         else:
             output = container.logs(stdout=True, stderr=True).decode(errors="ignore")
@@ -99,7 +141,8 @@ def exec_in_container(container: docker.models.containers.Container,
                       cmd: List[str],
                       workdir: Optional[str] = None,
                       environment: Optional[Dict[str, str]] = None,
-                      stream: bool = True) -> Tuple[int, str]:
+                      stream: bool = True,
+                      tail_lines: Optional[int] = None) -> Tuple[int, str]:
     exec_id = container.client.api.exec_create(
         container.id,
         cmd,
@@ -109,24 +152,63 @@ def exec_in_container(container: docker.models.containers.Container,
         stderr=True,
     )
     output = ""
-    if stream:
+    if tail_lines is not None:
+        # Keep only the last `tail_lines` lines so long-running commands use bounded memory
+        tail: deque = deque(maxlen=tail_lines)
+        partial = ""
+        sys.stdout.flush()
+        for i, chunk in enumerate(container.client.api.exec_start(exec_id, stream=True), 1):
+            if stream:
+                _echo(chunk)
+                if i % _FLUSH_EVERY_CHUNKS == 0:
+                    sys.stdout.flush()
+            lines = (partial + chunk.decode(errors="ignore")).split("\n")
+            partial = lines.pop()
+            tail.extend(lines)
+        sys.stdout.flush()
+        if partial:
+            tail.append(partial)
+        output = "\n".join(tail)
+    elif stream:
+        parts: List[bytes] = []
+        sys.stdout.flush()
         for chunk in container.client.api.exec_start(exec_id, stream=True):
-            s = chunk.decode(errors="ignore")
-            print(s, end="")
-            output += s
+            parts.append(chunk)
+            _echo(chunk)
+            if len(parts) % _FLUSH_EVERY_CHUNKS == 0:
+                sys.stdout.flush()
+        sys.stdout.flush()
+        output = b"".join(parts).decode(errors="ignore")
     else:
         output = container.client.api.exec_start(exec_id, stream=False).decode(errors="ignore")
     inspect = container.client.api.exec_inspect(exec_id)
     return inspect.get("ExitCode", 1), output
 
 
+class _BitsReader:
+    """Minimal file object over an iterator of byte chunks, for reading a tar stream without buffering it."""
+
+    def __init__(self, chunks) -> None:
+        self._chunks = iter(chunks)
+        self._buf = bytearray()
+
+    def read(self, n: int = -1) -> bytes:
+        while n < 0 or len(self._buf) < n:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buf += chunk
+        if n < 0:
+            n = len(self._buf)
+        out = bytes(self._buf[:n])
+        del self._buf[:n]
+        return out
+
+
 def copy_from_container(container: docker.models.containers.Container, path: str, dest: str) -> None:
     bits, stat = container.get_archive(path)
-    file_obj = io.BytesIO()
-    for chunk in bits:
-        file_obj.write(chunk)
-    file_obj.seek(0)
-    with tarfile.open(fileobj=file_obj) as tar:
+    # Extract while the archive downloads instead of holding it all in memory first
+    with tarfile.open(fileobj=_BitsReader(bits), mode='r|') as tar:
         tar.extractall(dest)
 
 
@@ -134,18 +216,53 @@ def parse_project_image(project_slug: str, registry_repo: str = "irissast/cwe-be
     return f"{registry_repo}:{project_slug}"
 
 
+# Size of the reads that feed a streamed tar archive to the Docker API
+_TAR_CHUNK_SIZE = 1024 * 1024
+
+
 def copy_dir_to_container(container: docker.models.containers.Container, src_dir: str, dest_dir: str) -> None:
     if not os.path.isdir(src_dir):
         raise FileNotFoundError(f"Source directory not found: {src_dir}")
+    src_dir = os.path.abspath(src_dir)
+
+    # Stream the archive through a pipe so taring and uploading overlap and
+    # the whole tree is never buffered in memory.
+    read_fd, write_fd = os.pipe()
+    producer_errors: List[BaseException] = []
+
+    def produce() -> None:
+        try:
+            with os.fdopen(write_fd, 'wb') as pipe_out, tarfile.open(fileobj=pipe_out, mode='w|') as tar:
+                # Add contents of src_dir under dest_dir path inside container; tarfile does the recursion
+                tar.add(src_dir, arcname=dest_dir.strip('/'), recursive=True)
+        except BaseException as e:
+            producer_errors.append(e)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        with os.fdopen(read_fd, 'rb') as pipe_in:
+            container.put_archive(path='/', data=iter(lambda: pipe_in.read(_TAR_CHUNK_SIZE), b""))
+    finally:
+        # Closing our end unblocks the producer if the upload failed early
+        producer.join()
+    if producer_errors:
+        raise producer_errors[0]
+
+
+def copy_file_to_container(container: docker.models.containers.Container, src_file: str, dest_path: str) -> None:
+    if not os.path.isfile(src_file):
+        raise FileNotFoundError(f"Source file not found: {src_file}")
 
     tar_stream = io.BytesIO()
     with tarfile.open(fileobj=tar_stream, mode='w') as tar:
-        # Add contents of src_dir under dest_dir path inside container
-        src_dir = os.path.abspath(src_dir)
-        for root, dirs, files in os.walk(src_dir):
-            for name in dirs + files:
-                full_path = os.path.join(root, name)
-                arcname = os.path.join(dest_dir.lstrip('/'), os.path.relpath(full_path, start=src_dir))
-                tar.add(full_path, arcname=arcname, recursive=False)
+        # Include the parent directory so it is created if missing inside the container
+        parent = os.path.dirname(dest_path.lstrip('/'))
+        if parent:
+            dir_info = tarfile.TarInfo(parent)
+            dir_info.type = tarfile.DIRTYPE
+            dir_info.mode = 0o755
+            tar.addfile(dir_info)
+        tar.add(src_file, arcname=dest_path.lstrip('/'), recursive=False)
     tar_stream.seek(0)
     container.put_archive(path='/', data=tar_stream.read())